@@ -7,50 +7,54 @@ using the provided banking dataset with 24 features including demographics,
 financial behavior, and engagement metrics.
 """
 
-import csv
-import random
-import math
-from collections import defaultdict, Counter
+import numpy as np
+import pandas as pd
+
+try:
+    from joblib import Parallel, delayed
+except ImportError:  # joblib is optional; per-cluster reporting then runs serially
+    Parallel = None
+
+# Business-importance weight of each normalized feature, aligned with the
+# columns produced by preprocess_banking_data (revenue and cross-sell are
+# reported on but not clustered on)
+FEATURE_WEIGHTS = np.array([0.05, 0.15, 0.10, 0.15, 0.05, 0.10, 0.10, 0.05, 0.05,
+                            0.10, 0.05, 0.05, 0.0, 0.0], dtype=np.float32)
 
 def load_banking_data(file_path):
-    """Load banking customer data from CSV file"""
-    customers = []
-    
-    with open(file_path, 'r', encoding='utf-8') as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            # Convert numeric fields
-            customer = {
-                'customerid': row['customerid'],
-                'age': int(row['age']),
-                'gender': row['gender'],
-                'income': int(row['income']),
-                'occupation': row['occupation'],
-                'location': row['location'],
-                'householdsize': int(row['householdsize']),
-                'accounttype': row['accounttype'],
-                'accounttenureyears': int(row['accounttenureyears']),
-                'avgbalance': float(row['avgbalance']),
-                'balancevolatility': float(row['balancevolatility']),
-                'loantype': row['loantype'],
-                'loanamount': float(row['loanamount']),
-                'creditscore': int(row['creditscore']),
-                'creditutilizationratio': float(row['creditutilizationratio']),
-                'delinquencycount': int(row['delinquencycount']),
-                'monthlytransactions': int(row['monthlytransactions']),
-                'digitalusage': int(row['digitalusage']),
-                'channelpreference': row['channelpreference'],
-                'dormantdays': int(row['dormantdays']),
-                'revenuecontribution': float(row['revenuecontribution']),
-                'crosssellindex': int(row['crosssellindex']),
-                'salarypattern': row['salarypattern'],
-                'spendcategory': row['spendcategory']
-            }
-            customers.append(customer)
-    
-    return customers
+    """Load banking customer data from CSV file into a DataFrame"""
+    # Compact numeric types and categorical codes for the text columns
+    dtypes = {
+        'customerid': 'string',
+        'age': 'int16',
+        'gender': 'category',
+        'income': 'int32',
+        'occupation': 'category',
+        'location': 'category',
+        'householdsize': 'int8',
+        'accounttype': 'category',
+        'accounttenureyears': 'int8',
+        'avgbalance': 'float64',
+        'balancevolatility': 'float64',
+        'loantype': 'category',
+        'loanamount': 'float64',
+        'creditscore': 'int16',
+        'creditutilizationratio': 'float64',
+        'delinquencycount': 'int8',
+        'monthlytransactions': 'int16',
+        'digitalusage': 'int8',
+        'channelpreference': 'category',
+        'dormantdays': 'int16',
+        'revenuecontribution': 'float64',
+        'crosssellindex': 'int8',
+        'salarypattern': 'category',
+        'spendcategory': 'category'
+    }
+    
+    # 'None' is a real loan type, not a missing value
+    return pd.read_csv(file_path, dtype=dtypes, keep_default_na=False, encoding='utf-8')
 
-def preprocess_banking_data(customers):
+def preprocess_banking_data(df):
     """Preprocess banking data for clustering"""
     # Select key numerical features for clustering
     numerical_features = [
@@ -59,148 +63,411 @@ def preprocess_banking_data(customers):
         'monthlytransactions', 'digitalusage', 'dormantdays', 'revenuecontribution',
         'crosssellindex'
     ]
+    feature_names = [
+        'age_norm', 'income_norm', 'tenure_norm', 'balance_norm', 'volatility_norm',
+        'loan_norm', 'credit_norm', 'utilization_norm', 'delinquency_norm',
+        'transactions_norm', 'digital_norm', 'dormant_norm', 'revenue_norm',
+        'crosssell_norm'
+    ]
     
-    # Normalize numerical features
-    normalized_customers = []
-    for customer in customers:
-        normalized_customer = customer.copy()
-        
-        # Normalize each numerical feature to 0-1 scale
-        normalized_customer['age_norm'] = customer['age'] / 100
-        normalized_customer['income_norm'] = customer['income'] / 500000  # Assuming max income around 500k
-        normalized_customer['tenure_norm'] = customer['accounttenureyears'] / 30  # Assuming max tenure 30 years
-        normalized_customer['balance_norm'] = customer['avgbalance'] / 1000000  # Assuming max balance 1M
-        normalized_customer['volatility_norm'] = customer['balancevolatility'] / 3  # Assuming max volatility 3
-        normalized_customer['loan_norm'] = customer['loanamount'] / 1000000  # Assuming max loan 1M
-        normalized_customer['credit_norm'] = customer['creditscore'] / 900  # Assuming max credit score 900
-        normalized_customer['utilization_norm'] = customer['creditutilizationratio'] / 1  # Already 0-1
-        normalized_customer['delinquency_norm'] = customer['delinquencycount'] / 10  # Assuming max 10 delinquencies
-        normalized_customer['transactions_norm'] = customer['monthlytransactions'] / 300  # Assuming max 300 transactions
-        normalized_customer['digital_norm'] = customer['digitalusage'] / 100  # Already 0-100
-        normalized_customer['dormant_norm'] = 1 - (customer['dormantdays'] / 365)  # Invert for recency
-        normalized_customer['revenue_norm'] = customer['revenuecontribution'] / 200000  # Assuming max revenue 200k
-        normalized_customer['crosssell_norm'] = customer['crosssellindex'] / 10  # Assuming max crosssell 10
-        
-        normalized_customers.append(normalized_customer)
-    
-    return normalized_customers, numerical_features
+    # Divisors that bring each feature onto a 0-1 scale (assumed maximums:
+    # income 500k, tenure 30 years, balance 1M, volatility 3, loan 1M,
+    # credit score 900, 10 delinquencies, 300 transactions, revenue 200k, ...)
+    scales = np.array([100, 5e5, 30, 1e6, 3, 1e6, 900, 1, 10, 300, 100, 365, 2e5, 10],
+                      dtype=np.float32)
+    
+    # These lists, scales and FEATURE_WEIGHTS are positionally aligned
+    assert len(feature_names) == len(scales) == len(numerical_features), \
+        "numerical_features, feature_names and scales must list the same features in the same order"
+    assert len(FEATURE_WEIGHTS) == len(numerical_features), \
+        f"FEATURE_WEIGHTS has {len(FEATURE_WEIGHTS)} weights for {len(numerical_features)} features"
+    
+    # Normalize all numerical features in one pass over a (customers x features) matrix
+    X = np.ascontiguousarray(df[numerical_features].to_numpy(dtype=np.float32))
+    X /= scales
+    dormant = numerical_features.index('dormantdays')
+    X[:, dormant] = 1 - X[:, dormant]  # Invert dormant days for recency
+    
+    return X, feature_names, df
 
-def calculate_banking_distance(customer1, customer2, features):
-    """Calculate weighted Euclidean distance for banking customers"""
-    # Define weights for different features based on business importance
-    weights = {
-        'age_norm': 0.05,
-        'income_norm': 0.15,
-        'tenure_norm': 0.10,
-        'balance_norm': 0.15,
-        'volatility_norm': 0.05,
-        'loan_norm': 0.10,
-        'credit_norm': 0.10,
-        'utilization_norm': 0.05,
-        'delinquency_norm': 0.05,
-        'transactions_norm': 0.10,
-        'digital_norm': 0.05,
-        'dormant_norm': 0.05
-    }
-    
-    distance = 0
-    for feature in features:
-        if feature in weights:
-            val1 = customer1[feature]
-            val2 = customer2[feature]
-            weight = weights[feature]
-            distance += weight * ((val1 - val2) ** 2)
+# Fits with fewer row-centroid pairs than this stay on the NumPy path: below
+# it, importing Numba and loading the compiled kernel cost more than they save
+NUMBA_MIN_PAIRS = 2_000_000
+
+_numba_kernels_cache = None
+
+def _numba_kernels():
+    """Import Numba and build the fused k-means kernels on first use
+    
+    Returns (kmeans_iter, max_abs_diff, get_num_threads), or None when
+    Numba is not installed, in which case k-means uses the NumPy path.
+    """
+    global _numba_kernels_cache
+    if _numba_kernels_cache is not None:
+        return _numba_kernels_cache or None
+    try:
+        from numba import njit, prange, get_num_threads
+    except ImportError:
+        _numba_kernels_cache = False
+        return None
+    
+    @njit(parallel=True, fastmath=True, boundscheck=False, cache=True)
+    def _kmeans_iter(X, Xw, C, Cw, new_C, labels, n_threads):
+        """One Lloyd iteration: assign each row to its nearest centroid and write new centroids to new_C
+        
+        Distances are plain Euclidean on the sqrt-weight scaled Xw/Cw; the
+        centroid update averages the unscaled rows of X.
+        """
+        n, d = X.shape
+        k = C.shape[0]
+        dw = Xw.shape[1]
+        
+        # Assign customers to nearest centroid (squared distance). Non-negative
+        # float32 bit patterns sort like the floats, so packing the distance in
+        # the high word and the cluster id in the low word makes the argmin a
+        # branchless integer min; ties still go to the lowest cluster id.
+        for i in prange(n):
+            best = np.uint64(0xFFFFFFFFFFFFFFFF)
+            for j in range(k):
+                dist = np.float32(0.0)
+                for f in range(dw):
+                    diff = Xw[i, f] - Cw[j, f]
+                    dist += diff * diff
+                packed = (np.uint64(np.float32(dist).view(np.uint32)) << np.uint64(32)) | np.uint64(j)
+                best = min(best, packed)
+            labels[i] = best & np.uint64(0xFFFFFFFF)
+        
+        # Accumulate per-cluster sums in per-thread buffers, then reduce
+        chunk = (n + n_threads - 1) // n_threads
+        sums = np.zeros((n_threads, k, d))
+        counts = np.zeros((n_threads, k), dtype=np.int64)
+        for t in prange(n_threads):
+            for i in range(t * chunk, min(n, (t + 1) * chunk)):
+                j = labels[i]
+                counts[t, j] += 1
+                for f in range(d):
+                    sums[t, j, f] += X[i, f]
+        
+        total_sums = sums.sum(axis=0)
+        total_counts = counts.sum(axis=0)
+        for j in range(k):
+            for f in range(d):
+                if total_counts[j] > 0:
+                    new_C[j, f] = total_sums[j, f] / total_counts[j]
+                else:  # Keep empty clusters in place
+                    new_C[j, f] = C[j, f]
+    
+    @njit(cache=True)
+    def _max_abs_diff(A, B, columns):
+        """Largest absolute element-wise difference between two centroid matrices over the masked columns"""
+        largest = 0.0
+        for j in range(A.shape[0]):
+            for f in range(A.shape[1]):
+                if columns[f]:
+                    largest = max(largest, abs(A[j, f] - B[j, f]))
+        return largest
+    
+    _numba_kernels_cache = (_kmeans_iter, _max_abs_diff, get_num_threads)
+    return _numba_kernels_cache
+
+def _elkan_assign(Xw, Cw, labels, upper, lower):
+    """Reassign customers to their nearest centroid using Elkan's triangle-inequality bounds
+    
+    Updates labels, upper (distance bound to the assigned centroid) and
+    lower (per-centroid distance bounds) in place.
+    """
+    cc = np.sqrt(((Cw[:, None, :] - Cw[None, :, :]) ** 2).sum(axis=2))
+    np.fill_diagonal(cc, np.inf)
+    half_nearest = 0.5 * cc.min(axis=1)
+    
+    # Customers closer to their centroid than half the gap to any other stay put
+    active = np.flatnonzero(upper > half_nearest[labels])
+    if active.size == 0:
+        return
+    
+    # Tighten the upper bound with the exact distance to the assigned centroid
+    upper[active] = np.sqrt(((Xw[active] - Cw[labels[active]]) ** 2).sum(axis=1))
+    lower[active, labels[active]] = upper[active]
+    
+    for j in range(len(Cw)):
+        assigned = labels[active]
+        candidates = active[(assigned != j) &
+                            (upper[active] > lower[active, j]) &
+                            (upper[active] > 0.5 * cc[assigned, j])]
+        if candidates.size == 0:
+            continue
+        d = np.sqrt(((Xw[candidates] - Cw[j]) ** 2).sum(axis=1))
+        lower[candidates, j] = d
+        closer = d < upper[candidates]
+        labels[candidates[closer]] = j
+        upper[candidates[closer]] = d[closer]
+
+def _weighted_features(X):
+    """Scale X by sqrt(weight) so the weighted distance becomes a plain Euclidean one
+    
+    Zero-weight features are dropped from the distance space entirely.
+    Returns the feature mask, the sqrt weights and the scaled matrix.
+    """
+    weighted = FEATURE_WEIGHTS > 0
+    sqrt_w = np.sqrt(FEATURE_WEIGHTS[weighted])
+    Xw = np.ascontiguousarray(X[:, weighted] * sqrt_w)
+    return weighted, sqrt_w, Xw
+
+def _squared_distances(Xw, x_norm2, Cw):
+    """All row-to-centroid squared distances via ||x||^2 + ||c||^2 - 2x.c"""
+    return x_norm2 + (Cw * Cw).sum(axis=1) - 2 * Xw @ Cw.T
+
+def _seed_centroids(Xw, k):
+    """Farthest-point seeding: indices of k mutually distant rows, starting from row 0"""
+    # Track each customer's squared distance to its nearest centroid chosen so far
+    centroid_idx = [0]
+    min_d2 = ((Xw - Xw[0]) ** 2).sum(axis=1)
+    for _ in range(k-1):
+        j = int(np.argmax(min_d2))
+        centroid_idx.append(j)
+        min_d2 = np.minimum(min_d2, ((Xw - Xw[j]) ** 2).sum(axis=1))
+    return centroid_idx
+
+def banking_minibatch_kmeans(X, k=5, batch_size=1024, max_iter=100, seed=42, max_no_improvement=10):
+    """Mini-batch K-means for large customer bases
+    
+    Each iteration assigns only a random batch of rows and moves every
+    centroid towards its batch mean with a per-cluster learning rate, so
+    the centroid is the running mean of all rows it has been assigned.
+    
+    The learning rate shrinks on its own, so centroid shifts say nothing
+    about convergence; instead the run stops once a smoothed per-batch
+    inertia has not improved for max_no_improvement consecutive batches.
+    """
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    weighted, sqrt_w, Xw = _weighted_features(X)
+    x_norm2 = (Xw * Xw).sum(axis=1, keepdims=True)
+    
+    centroids = X[_seed_centroids(Xw, k)]
+    new_centroids = np.empty_like(centroids)
+    counts = np.zeros(k, dtype=np.int64)
+    rng = np.random.default_rng(seed)
+    batch_size = min(batch_size, len(X))
+    
+    # Exponentially weighted average of the batch inertia, smoothing over
+    # roughly half a pass over the data
+    alpha = min(1.0, 2.0 * batch_size / (len(X) + 1))
+    ewa_inertia = None
+    best_inertia = np.inf
+    no_improvement = 0
+    
+    for iteration in range(max_iter):
+        idx = rng.choice(len(X), batch_size, replace=False)
+        Cw = centroids[:, weighted] * sqrt_w
+        D2 = _squared_distances(Xw[idx], x_norm2[idx], Cw)
+        batch_labels = np.argmin(D2, axis=1)
+        batch_inertia = np.maximum(D2[np.arange(batch_size), batch_labels], 0).mean()
+        
+        # Per-cluster batch sums, folded into the running means
+        batch_counts = np.bincount(batch_labels, minlength=k)
+        batch_sums = np.column_stack([
+            np.bincount(batch_labels, weights=X[idx, f], minlength=k)
+            for f in range(X.shape[1])
+        ])
+        counts += batch_counts
+        seen = batch_counts > 0
+        eta = (batch_counts[seen] / counts[seen])[:, None]
+        batch_means = batch_sums[seen] / batch_counts[seen][:, None]
+        new_centroids[:] = centroids
+        new_centroids[seen] += (eta * (batch_means - centroids[seen])).astype(X.dtype)
+        centroids, new_centroids = new_centroids, centroids
+        
+        # Stop once the smoothed batch inertia has stopped improving
+        if ewa_inertia is None:
+            ewa_inertia = batch_inertia
+        else:
+            ewa_inertia = ewa_inertia * (1 - alpha) + batch_inertia * alpha
+        if ewa_inertia < best_inertia:
+            best_inertia = ewa_inertia
+            no_improvement = 0
+        else:
+            no_improvement += 1
+            if no_improvement >= max_no_improvement:
+                break
     
-    return math.sqrt(distance)
+    # Final labels for every customer against the learned centroids
+    Cw = centroids[:, weighted] * sqrt_w
+    labels = np.argmin(_squared_distances(Xw, x_norm2, Cw), axis=1).astype(np.int32)
+    return labels, centroids
 
-def banking_kmeans(customers, k=5, max_iterations=50):
-    """K-means clustering for banking customers"""
-    features = ['age_norm', 'income_norm', 'tenure_norm', 'balance_norm', 'volatility_norm',
-                'loan_norm', 'credit_norm', 'utilization_norm', 'delinquency_norm',
-                'transactions_norm', 'digital_norm', 'dormant_norm']
+def banking_kmeans(X, k=5, max_iterations=50, algorithm='full', batch_size=1024):
+    """K-means clustering for banking customers on a normalized feature matrix
+    
+    algorithm='full' runs Lloyd iterations over every row, through the
+    compiled Numba kernel once the fit reaches NUMBA_MIN_PAIRS row-centroid
+    pairs and Numba is installed; 'minibatch' delegates to
+    banking_minibatch_kmeans for large customer bases.
+    """
+    if algorithm == 'minibatch':
+        return banking_minibatch_kmeans(X, k, batch_size=batch_size, max_iter=max_iterations)
+    if algorithm != 'full':
+        raise ValueError(f"Unknown k-means algorithm: {algorithm!r}")
+    
+    # Single-precision, row-major storage halves memory traffic in the distance math
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    weighted, sqrt_w, Xw = _weighted_features(X)
+    x_norm2 = (Xw * Xw).sum(axis=1, keepdims=True)
     
     # Smart initialization: select diverse customers as initial centroids
-    centroids = []
-    centroids.append(customers[0].copy())
-    
-    for _ in range(k-1):
-        max_distance = 0
-        best_customer = None
-        
-        for customer in customers:
-            min_distance_to_centroids = min([
-                calculate_banking_distance(customer, centroid, features) 
-                for centroid in centroids
-            ])
-            
-            if min_distance_to_centroids > max_distance:
-                max_distance = min_distance_to_centroids
-                best_customer = customer
-        
-        if best_customer:
-            centroids.append(best_customer.copy())
+    # (fancy indexing already copies the rows); new_centroids is the swap buffer
+    centroids = X[_seed_centroids(Xw, k)]
+    new_centroids = np.empty_like(centroids)
+    
+    # Compiled fused assign/update kernel for large fits when Numba is installed
+    kernels = _numba_kernels() if len(X) * k >= NUMBA_MIN_PAIRS else None
+    if kernels is not None:
+        kmeans_iter, max_abs_diff, get_num_threads = kernels
+        labels = np.empty(len(X), dtype=np.int32)
+        for iteration in range(max_iterations):
+            Cw = np.ascontiguousarray(centroids[:, weighted] * sqrt_w)
+            kmeans_iter(X, Xw, centroids, Cw, new_centroids, labels, get_num_threads())
+            # Convergence is judged on the clustered (weighted) features only
+            converged = max_abs_diff(centroids, new_centroids, weighted) <= 0.01
+            centroids, new_centroids = new_centroids, centroids
+            if converged:
+                break
+        return labels, centroids
     
     # K-means iterations
+    labels = None
     for iteration in range(max_iterations):
-        clusters = [[] for _ in range(k)]
-        
-        # Assign customers to nearest centroid
-        for customer in customers:
-            distances = [
-                calculate_banking_distance(customer, centroid, features) 
-                for centroid in centroids
-            ]
-            closest_cluster = distances.index(min(distances))
-            clusters[closest_cluster].append(customer)
-        
-        # Update centroids
-        new_centroids = []
-        for cluster in clusters:
-            if cluster:
-                new_centroid = {}
-                for feature in features:
-                    values = [customer[feature] for customer in cluster]
-                    new_centroid[feature] = sum(values) / len(values)
-                new_centroids.append(new_centroid)
-            else:
-                new_centroids.append(centroids[len(new_centroids)])
-        
-        # Check convergence
-        converged = True
-        for i in range(k):
-            for feature in features:
-                if abs(centroids[i][feature] - new_centroids[i][feature]) > 0.01:
-                    converged = False
-                    break
-            if not converged:
-                break
-        
-        centroids = new_centroids
+        Cw = centroids[:, weighted] * sqrt_w
+        if labels is None:
+            # Assign customers to nearest centroid
+            D2 = _squared_distances(Xw, x_norm2, Cw)
+            lower = np.sqrt(np.maximum(D2, 0))
+            labels = np.argmin(lower, axis=1).astype(np.int32)
+            upper = lower[np.arange(len(X)), labels]
+        else:
+            # Only recompute distances the bounds cannot rule out
+            _elkan_assign(Xw, Cw, labels, upper, lower)
+        
+        # Update centroids with one grouped sum per feature column
+        counts = np.bincount(labels, minlength=k)
+        sums = np.column_stack([
+            np.bincount(labels, weights=X[:, f], minlength=k)
+            for f in range(X.shape[1])
+        ])
+        np.divide(sums, np.maximum(counts, 1)[:, None], out=new_centroids, casting='unsafe')
+        new_centroids[counts == 0] = centroids[counts == 0]  # Keep empty clusters in place
+        
+        # Loosen the bounds by how far each centroid moved
+        shift = np.sqrt((((new_centroids - centroids)[:, weighted] * sqrt_w) ** 2).sum(axis=1))
+        upper += shift[labels]
+        np.maximum(lower - shift, 0, out=lower)
+        
+        # Check convergence on the clustered (weighted) features only
+        converged = np.abs(new_centroids - centroids)[:, weighted].max() <= 0.01
+        centroids, new_centroids = new_centroids, centroids
         if converged:
             break
     
-    # Assign final cluster labels
-    for i, cluster in enumerate(clusters):
-        for customer in cluster:
-            customer['cluster'] = i
+    return labels, centroids
+
+def _category_counts(counts, top=None):
+    """Dict of category counts listed in first-seen order, optionally keeping only the top entries
+    
+    counts comes from a groupby(..., sort=False).size(), so categories are
+    in order of first appearance, as collections.Counter would list them;
+    the stable sort keeps that order for ties, as Counter.most_common does.
+    """
+    if top is not None:
+        counts = counts.sort_values(ascending=False, kind='stable').head(top)
+    return counts.to_dict()
+
+def _map_clusters(func, args_list):
+    """Apply func to each argument tuple, across threads when joblib is available"""
+    if Parallel is None or len(args_list) < 2:
+        return [func(*args) for args in args_list]
+    return Parallel(n_jobs=-1, prefer='threads')(delayed(func)(*args) for args in args_list)
+
+def _analyze_one_cluster(cluster_id, stats, cat_counts, total_customers, total_revenue, total_balance):
+    """Summary statistics and report lines for one cluster"""
+    lines = []
+    cluster_size = int(stats[('age', 'count')])
+    cluster_percentage = (cluster_size / total_customers) * 100
+    cluster_revenue = stats[('revenuecontribution', 'sum')]
+    cluster_balance = stats[('avgbalance', 'sum')]
+    cluster_avg_value = cluster_revenue / cluster_size
+    
+    lines.append(f"\n🏷️  CLUSTER {cluster_id} ({cluster_size} customers - {cluster_percentage:.1f}%)")
+    lines.append(f"   Revenue Contribution: ₹{cluster_revenue:,.2f} ({cluster_revenue/total_revenue*100:.1f}%)")
+    lines.append(f"   Deposit Contribution: ₹{cluster_balance:,.2f} ({cluster_balance/total_balance*100:.1f}%)")
+    lines.append(f"   Average Customer Value: ₹{cluster_avg_value:,.2f}")
+    
+    # Averages for key metrics
+    avg_age = stats[('age', 'mean')]
+    avg_income = stats[('income', 'mean')]
+    avg_balance = stats[('avgbalance', 'mean')]
+    avg_credit_score = stats[('creditscore', 'mean')]
+    avg_tenure = stats[('accounttenureyears', 'mean')]
+    avg_transactions = stats[('monthlytransactions', 'mean')]
+    avg_digital_usage = stats[('digitalusage', 'mean')]
+    avg_dormant_days = stats[('dormantdays', 'mean')]
+    avg_crosssell = stats[('crosssellindex', 'mean')]
+    avg_loan_amount = stats[('loanamount', 'mean')]
+    
+    lines.append(f"   📈 Key Metrics:")
+    lines.append(f"      • Average Age: {avg_age:.1f} years")
+    lines.append(f"      • Average Income: ₹{avg_income:,.0f}")
+    lines.append(f"      • Average Balance: ₹{avg_balance:,.0f}")
+    lines.append(f"      • Average Credit Score: {avg_credit_score:.0f}")
+    lines.append(f"      • Average Tenure: {avg_tenure:.1f} years")
+    lines.append(f"      • Monthly Transactions: {avg_transactions:.1f}")
+    lines.append(f"      • Digital Usage: {avg_digital_usage:.1f}%")
+    lines.append(f"      • Dormant Days: {avg_dormant_days:.1f}")
+    lines.append(f"      • Cross-sell Index: {avg_crosssell:.1f}")
+    
+    # Categorical analysis
+    gender_dist = _category_counts(cat_counts['gender'].loc[cluster_id])
+    occupation_dist = _category_counts(cat_counts['occupation'].loc[cluster_id], top=2)
+    location_dist = _category_counts(cat_counts['location'].loc[cluster_id], top=2)
+    account_type_dist = _category_counts(cat_counts['accounttype'].loc[cluster_id])
+    channel_dist = _category_counts(cat_counts['channelpreference'].loc[cluster_id])
+    
+    lines.append(f"   👥 Demographics:")
+    lines.append(f"      • Gender: {gender_dist}")
+    lines.append(f"      • Top Occupation: {list(occupation_dist.items())}")
+    lines.append(f"      • Top Location: {list(location_dist.items())}")
+    lines.append(f"      • Account Types: {account_type_dist}")
+    lines.append(f"      • Channel Preference: {channel_dist}")
+    
+    cluster_summary = {
+        'id': int(cluster_id),
+        'size': cluster_size,
+        'percentage': cluster_percentage,
+        'revenue': cluster_revenue,
+        'balance': cluster_balance,
+        'avg_value': cluster_avg_value,
+        'avg_age': avg_age,
+        'avg_income': avg_income,
+        'avg_balance': avg_balance,
+        'avg_credit_score': avg_credit_score,
+        'avg_tenure': avg_tenure,
+        'avg_transactions': avg_transactions,
+        'avg_digital_usage': avg_digital_usage,
+        'avg_dormant_days': avg_dormant_days,
+        'avg_crosssell': avg_crosssell,
+        'avg_loanamount': avg_loan_amount
+    }
     
-    return customers, centroids, clusters
+    return cluster_summary, lines
 
-def analyze_banking_clusters(customers):
+def analyze_banking_clusters(df, totals):
     """Comprehensive analysis of banking customer clusters"""
     print("=" * 80)
     print("🏦 BANKING CUSTOMER SEGMENTATION ANALYSIS")
     print("=" * 80)
     
-    # Group by clusters
-    clusters = defaultdict(list)
-    for customer in customers:
-        clusters[customer['cluster']].append(customer)
-    
     # Overall statistics
-    total_customers = len(customers)
-    total_revenue = sum(customer['revenuecontribution'] for customer in customers)
-    total_balance = sum(customer['avgbalance'] for customer in customers)
+    total_customers = len(df)
+    total_revenue = totals['revenue']
+    total_balance = totals['balance']
     
     print(f"\n📊 BANKING OVERVIEW:")
     print(f"   Total Customers: {total_customers:,}")
@@ -212,80 +479,146 @@ def analyze_banking_clusters(customers):
     print(f"\n🔍 CLUSTER ANALYSIS:")
     print("-" * 80)
     
+    # All per-cluster numerical aggregates in one grouped pass
+    grouped = df.groupby('cluster', observed=True)
+    num_stats = grouped[['age', 'income', 'avgbalance', 'creditscore', 'accounttenureyears',
+                         'monthlytransactions', 'digitalusage', 'dormantdays',
+                         'crosssellindex', 'loanamount', 'revenuecontribution']].agg(['mean', 'sum', 'count'])
+    
+    # Category distributions for all clusters in one grouped pass per column,
+    # each cluster's categories in first-seen order
+    cat_counts = {col: df.groupby(['cluster', col], observed=True, sort=False).size()
+                  for col in ['gender', 'occupation', 'location', 'accounttype', 'channelpreference']}
+    
+    # Clusters are summarized in parallel; their reports are printed in order
+    results = _map_clusters(_analyze_one_cluster, [
+        (cluster_id, stats, cat_counts, total_customers, total_revenue, total_balance)
+        for cluster_id, stats in num_stats.iterrows()
+    ])
+    
     cluster_stats = []
+    for cluster_summary, lines in results:
+        print('\n'.join(lines))
+        cluster_stats.append(cluster_summary)
     
-    for cluster_id in sorted(clusters.keys()):
-        cluster_customers = clusters[cluster_id]
-        cluster_size = len(cluster_customers)
-        cluster_percentage = (cluster_size / total_customers) * 100
-        cluster_revenue = sum(customer['revenuecontribution'] for customer in cluster_customers)
-        cluster_balance = sum(customer['avgbalance'] for customer in cluster_customers)
-        cluster_avg_value = cluster_revenue / cluster_size
-        
-        print(f"\n🏷️  CLUSTER {cluster_id} ({cluster_size} customers - {cluster_percentage:.1f}%)")
-        print(f"   Revenue Contribution: ₹{cluster_revenue:,.2f} ({cluster_revenue/total_revenue*100:.1f}%)")
-        print(f"   Deposit Contribution: ₹{cluster_balance:,.2f} ({cluster_balance/total_balance*100:.1f}%)")
-        print(f"   Average Customer Value: ₹{cluster_avg_value:,.2f}")
-        
-        # Calculate averages for key metrics
-        avg_age = sum(c['age'] for c in cluster_customers) / cluster_size
-        avg_income = sum(c['income'] for c in cluster_customers) / cluster_size
-        avg_balance = sum(c['avgbalance'] for c in cluster_customers) / cluster_size
-        avg_credit_score = sum(c['creditscore'] for c in cluster_customers) / cluster_size
-        avg_tenure = sum(c['accounttenureyears'] for c in cluster_customers) / cluster_size
-        avg_transactions = sum(c['monthlytransactions'] for c in cluster_customers) / cluster_size
-        avg_digital_usage = sum(c['digitalusage'] for c in cluster_customers) / cluster_size
-        avg_dormant_days = sum(c['dormantdays'] for c in cluster_customers) / cluster_size
-        avg_crosssell = sum(c['crosssellindex'] for c in cluster_customers) / cluster_size
-        avg_loan_amount = sum(c['loanamount'] for c in cluster_customers) / cluster_size
-        
-        print(f"   📈 Key Metrics:")
-        print(f"      • Average Age: {avg_age:.1f} years")
-        print(f"      • Average Income: ₹{avg_income:,.0f}")
-        print(f"      • Average Balance: ₹{avg_balance:,.0f}")
-        print(f"      • Average Credit Score: {avg_credit_score:.0f}")
-        print(f"      • Average Tenure: {avg_tenure:.1f} years")
-        print(f"      • Monthly Transactions: {avg_transactions:.1f}")
-        print(f"      • Digital Usage: {avg_digital_usage:.1f}%")
-        print(f"      • Dormant Days: {avg_dormant_days:.1f}")
-        print(f"      • Cross-sell Index: {avg_crosssell:.1f}")
-        
-        # Categorical analysis
-        gender_dist = Counter(c['gender'] for c in cluster_customers)
-        occupation_dist = Counter(c['occupation'] for c in cluster_customers)
-        location_dist = Counter(c['location'] for c in cluster_customers)
-        account_type_dist = Counter(c['accounttype'] for c in cluster_customers)
-        channel_dist = Counter(c['channelpreference'] for c in cluster_customers)
-        
-        print(f"   👥 Demographics:")
-        print(f"      • Gender: {dict(gender_dist)}")
-        print(f"      • Top Occupation: {occupation_dist.most_common(2)}")
-        print(f"      • Top Location: {location_dist.most_common(2)}")
-        print(f"      • Account Types: {dict(account_type_dist)}")
-        print(f"      • Channel Preference: {dict(channel_dist)}")
-        
-        cluster_stats.append({
-            'id': cluster_id,
-            'size': cluster_size,
-            'percentage': cluster_percentage,
-            'revenue': cluster_revenue,
-            'balance': cluster_balance,
-            'avg_value': cluster_avg_value,
-            'avg_age': avg_age,
-            'avg_income': avg_income,
-            'avg_balance': avg_balance,
-            'avg_credit_score': avg_credit_score,
-            'avg_tenure': avg_tenure,
-            'avg_transactions': avg_transactions,
-            'avg_digital_usage': avg_digital_usage,
-            'avg_dormant_days': avg_dormant_days,
-            'avg_crosssell': avg_crosssell,
-            'avg_loanamount': avg_loan_amount
-        })
-    
-    return cluster_stats, clusters
+    return cluster_stats
 
-def generate_banking_insights(cluster_stats, clusters):
+def _cluster_insight(cluster):
+    """Segment type, recommendations and revenue potential report lines for one cluster"""
+    lines = []
+    cluster_id = cluster['id']
+    
+    lines.append(f"\n🎯 CLUSTER {cluster_id} - {cluster['size']} customers (₹{cluster['revenue']:,.0f} revenue)")
+    lines.append("-" * 60)
+    
+    # Determine banking segment type
+    if (cluster['avg_income'] > 150000 and cluster['avg_balance'] > 200000 and 
+        cluster['avg_credit_score'] > 700):
+        segment_type = "💎 PREMIUM BANKING CLIENTS"
+        characteristics = [
+            "High income and deposit balances",
+            "Excellent credit scores",
+            "Long-term relationship potential"
+        ]
+        recommendations = [
+            "🏆 Premium banking services and dedicated relationship manager",
+            "💎 Exclusive investment and wealth management products",
+            "🎫 Priority customer service and concierge banking",
+            "📈 Advanced financial planning and advisory services"
+        ]
+    elif (cluster['avg_dormant_days'] > 180 and cluster['avg_transactions'] < 20):
+        segment_type = "⚠️ AT-RISK CUSTOMERS"
+        characteristics = [
+            "Low transaction activity and high dormancy",
+            "Potential churn risk",
+            "Need re-engagement strategy"
+        ]
+        recommendations = [
+            "📧 Proactive outreach and win-back campaigns",
+            "🎁 Special offers and fee waivers",
+            "📞 Personal banking consultation",
+            "🔄 Product recommendations based on profile"
+        ]
+    elif (cluster['avg_digital_usage'] > 70 and cluster['avg_age'] < 40):
+        segment_type = "📱 DIGITAL-FIRST CUSTOMERS"
+        characteristics = [
+            "High digital engagement and younger demographic",
+            "Tech-savvy and mobile-first",
+            "Prefer self-service channels"
+        ]
+        recommendations = [
+            "📱 Enhanced mobile banking features and app optimization",
+            "🤖 AI-powered chatbots and digital assistants",
+            "💳 Digital payment solutions and fintech partnerships",
+            "🎮 Gamification and rewards programs"
+        ]
+    elif (cluster['avg_loanamount'] > 300000 and cluster['avg_crosssell'] < 2):
+        segment_type = "🏠 LOAN CUSTOMERS - CROSS-SELL OPPORTUNITY"
+        characteristics = [
+            "Active loan customers with low cross-sell",
+            "High loan amounts but limited product usage",
+            "Cross-selling potential"
+        ]
+        recommendations = [
+            "💳 Credit card and personal loan offers",
+            "🏦 Investment and insurance product recommendations",
+            "📊 Financial health check and product bundling",
+            "🎯 Targeted cross-sell campaigns"
+        ]
+    elif (cluster['avg_tenure'] > 10 and cluster['avg_balance'] > 100000):
+        segment_type = "🛡️ LOYAL CUSTOMERS"
+        characteristics = [
+            "Long-term customers with stable balances",
+            "High loyalty and low churn risk",
+            "Relationship-focused banking"
+        ]
+        recommendations = [
+            "🎁 Loyalty rewards and relationship benefits",
+            "📈 Upselling to premium products and services",
+            "💬 Regular relationship reviews and feedback",
+            "🏆 Recognition programs and exclusive events"
+        ]
+    else:
+        segment_type = "🛒 STANDARD BANKING CUSTOMERS"
+        characteristics = [
+            "Average engagement across all metrics",
+            "Price-sensitive and value-conscious",
+            "Regular banking needs"
+        ]
+        recommendations = [
+            "💳 Competitive rates and fee structures",
+            "📦 Bundle products and service packages",
+            "📧 Educational content and financial literacy",
+            "🎯 Targeted promotions and seasonal offers"
+        ]
+    
+    lines.append(f"Segment Type: {segment_type}")
+    lines.append(f"Key Characteristics:")
+    for char in characteristics:
+        lines.append(f"   • {char}")
+    
+    lines.append(f"Strategic Recommendations:")
+    for rec in recommendations:
+        lines.append(f"   {rec}")
+    
+    # Calculate potential impact
+    current_avg_value = cluster['avg_value']
+    if "PREMIUM" in segment_type:
+        potential_increase = current_avg_value * 0.20  # 20% increase potential
+    elif "AT-RISK" in segment_type:
+        potential_increase = current_avg_value * 0.25  # 25% retention value
+    elif "DIGITAL" in segment_type:
+        potential_increase = current_avg_value * 0.15  # 15% increase potential
+    elif "CROSS-SELL" in segment_type:
+        potential_increase = current_avg_value * 0.30  # 30% cross-sell potential
+    else:
+        potential_increase = current_avg_value * 0.10  # 10% increase potential
+    
+    lines.append(f"💰 Revenue Potential: ₹{potential_increase * cluster['size']:,.0f} additional revenue")
+    
+    return lines
+
+def generate_banking_insights(cluster_stats):
     """Generate banking-specific business insights and recommendations"""
     print(f"\n💡 BANKING BUSINESS INSIGHTS & STRATEGIC RECOMMENDATIONS")
     print("=" * 80)
@@ -293,248 +626,79 @@ def generate_banking_insights(cluster_stats, clusters):
     # Sort clusters by revenue contribution
     sorted_clusters = sorted(cluster_stats, key=lambda x: x['revenue'], reverse=True)
     
-    for i, cluster in enumerate(sorted_clusters):
-        cluster_id = cluster['id']
-        cluster_customers = clusters[cluster_id]
-        
-        print(f"\n🎯 CLUSTER {cluster_id} - {cluster['size']} customers (₹{cluster['revenue']:,.0f} revenue)")
-        print("-" * 60)
-        
-        # Determine banking segment type
-        if (cluster['avg_income'] > 150000 and cluster['avg_balance'] > 200000 and 
-            cluster['avg_credit_score'] > 700):
-            segment_type = "💎 PREMIUM BANKING CLIENTS"
-            characteristics = [
-                "High income and deposit balances",
-                "Excellent credit scores",
-                "Long-term relationship potential"
-            ]
-            recommendations = [
-                "🏆 Premium banking services and dedicated relationship manager",
-                "💎 Exclusive investment and wealth management products",
-                "🎫 Priority customer service and concierge banking",
-                "📈 Advanced financial planning and advisory services"
-            ]
-        elif (cluster['avg_dormant_days'] > 180 and cluster['avg_transactions'] < 20):
-            segment_type = "⚠️ AT-RISK CUSTOMERS"
-            characteristics = [
-                "Low transaction activity and high dormancy",
-                "Potential churn risk",
-                "Need re-engagement strategy"
-            ]
-            recommendations = [
-                "📧 Proactive outreach and win-back campaigns",
-                "🎁 Special offers and fee waivers",
-                "📞 Personal banking consultation",
-                "🔄 Product recommendations based on profile"
-            ]
-        elif (cluster['avg_digital_usage'] > 70 and cluster['avg_age'] < 40):
-            segment_type = "📱 DIGITAL-FIRST CUSTOMERS"
-            characteristics = [
-                "High digital engagement and younger demographic",
-                "Tech-savvy and mobile-first",
-                "Prefer self-service channels"
-            ]
-            recommendations = [
-                "📱 Enhanced mobile banking features and app optimization",
-                "🤖 AI-powered chatbots and digital assistants",
-                "💳 Digital payment solutions and fintech partnerships",
-                "🎮 Gamification and rewards programs"
-            ]
-        elif (cluster['avg_loanamount'] > 300000 and cluster['avg_crosssell'] < 2):
-            segment_type = "🏠 LOAN CUSTOMERS - CROSS-SELL OPPORTUNITY"
-            characteristics = [
-                "Active loan customers with low cross-sell",
-                "High loan amounts but limited product usage",
-                "Cross-selling potential"
-            ]
-            recommendations = [
-                "💳 Credit card and personal loan offers",
-                "🏦 Investment and insurance product recommendations",
-                "📊 Financial health check and product bundling",
-                "🎯 Targeted cross-sell campaigns"
-            ]
-        elif (cluster['avg_tenure'] > 10 and cluster['avg_balance'] > 100000):
-            segment_type = "🛡️ LOYAL CUSTOMERS"
-            characteristics = [
-                "Long-term customers with stable balances",
-                "High loyalty and low churn risk",
-                "Relationship-focused banking"
-            ]
-            recommendations = [
-                "🎁 Loyalty rewards and relationship benefits",
-                "📈 Upselling to premium products and services",
-                "💬 Regular relationship reviews and feedback",
-                "🏆 Recognition programs and exclusive events"
-            ]
-        else:
-            segment_type = "🛒 STANDARD BANKING CUSTOMERS"
-            characteristics = [
-                "Average engagement across all metrics",
-                "Price-sensitive and value-conscious",
-                "Regular banking needs"
-            ]
-            recommendations = [
-                "💳 Competitive rates and fee structures",
-                "📦 Bundle products and service packages",
-                "📧 Educational content and financial literacy",
-                "🎯 Targeted promotions and seasonal offers"
-            ]
-        
-        print(f"Segment Type: {segment_type}")
-        print(f"Key Characteristics:")
-        for char in characteristics:
-            print(f"   • {char}")
-        
-        print(f"Strategic Recommendations:")
-        for rec in recommendations:
-            print(f"   {rec}")
-        
-        # Calculate potential impact
-        current_avg_value = cluster['avg_value']
-        if "PREMIUM" in segment_type:
-            potential_increase = current_avg_value * 0.20  # 20% increase potential
-        elif "AT-RISK" in segment_type:
-            potential_increase = current_avg_value * 0.25  # 25% retention value
-        elif "DIGITAL" in segment_type:
-            potential_increase = current_avg_value * 0.15  # 15% increase potential
-        elif "CROSS-SELL" in segment_type:
-            potential_increase = current_avg_value * 0.30  # 30% cross-sell potential
-        else:
-            potential_increase = current_avg_value * 0.10  # 10% increase potential
-        
-        print(f"💰 Revenue Potential: ₹{potential_increase * cluster['size']:,.0f} additional revenue")
+    for lines in _map_clusters(_cluster_insight, [(cluster,) for cluster in sorted_clusters]):
+        print('\n'.join(lines))
 
-def add_enhanced_segments(customers):
-    """Add enhanced, human-readable segmentation columns"""
-    for customer in customers:
-        # 1. Customer Value Tier
-        if customer['revenuecontribution'] > 100000:
-            customer['value_tier'] = 'Premium'
-        elif customer['revenuecontribution'] > 50000:
-            customer['value_tier'] = 'Gold'
-        elif customer['revenuecontribution'] > 25000:
-            customer['value_tier'] = 'Silver'
-        else:
-            customer['value_tier'] = 'Bronze'
-        
-        # 2. Risk Level
-        if customer['delinquencycount'] > 3 or customer['creditutilizationratio'] > 0.8:
-            customer['risk_level'] = 'High Risk'
-        elif customer['delinquencycount'] > 1 or customer['creditutilizationratio'] > 0.6:
-            customer['risk_level'] = 'Medium Risk'
-        else:
-            customer['risk_level'] = 'Low Risk'
-        
-        # 3. Digital Adoption Level
-        if customer['digitalusage'] > 70:
-            customer['digital_level'] = 'Digital Native'
-        elif customer['digitalusage'] > 40:
-            customer['digital_level'] = 'Digital Adopter'
-        else:
-            customer['digital_level'] = 'Traditional'
-        
-        # 4. Engagement Status
-        if customer['dormantdays'] > 180:
-            customer['engagement_status'] = 'Dormant'
-        elif customer['dormantdays'] > 90:
-            customer['engagement_status'] = 'At Risk'
-        elif customer['monthlytransactions'] > 100:
-            customer['engagement_status'] = 'Highly Active'
-        else:
-            customer['engagement_status'] = 'Active'
-        
-        # 5. Life Stage
-        if customer['age'] < 30:
-            customer['life_stage'] = 'Young Professional'
-        elif customer['age'] < 45:
-            customer['life_stage'] = 'Established Professional'
-        elif customer['age'] < 60:
-            customer['life_stage'] = 'Pre-Retirement'
-        else:
-            customer['life_stage'] = 'Retired'
-        
-        # 6. Financial Health Score
-        health_score = 0
-        if customer['creditscore'] > 700:
-            health_score += 3
-        elif customer['creditscore'] > 600:
-            health_score += 2
-        else:
-            health_score += 1
-        
-        if customer['creditutilizationratio'] < 0.3:
-            health_score += 3
-        elif customer['creditutilizationratio'] < 0.6:
-            health_score += 2
-        else:
-            health_score += 1
-        
-        if customer['delinquencycount'] == 0:
-            health_score += 3
-        elif customer['delinquencycount'] < 2:
-            health_score += 2
-        else:
-            health_score += 1
-        
-        if health_score >= 8:
-            customer['financial_health'] = 'Excellent'
-        elif health_score >= 6:
-            customer['financial_health'] = 'Good'
-        elif health_score >= 4:
-            customer['financial_health'] = 'Fair'
-        else:
-            customer['financial_health'] = 'Poor'
-        
-        # 7. Product Potential
-        if customer['crosssellindex'] < 1:
-            customer['product_potential'] = 'High Cross-sell'
-        elif customer['crosssellindex'] < 3:
-            customer['product_potential'] = 'Medium Cross-sell'
-        else:
-            customer['product_potential'] = 'Low Cross-sell'
-        
-        # 8. Channel Preference Type
-        if customer['channelpreference'] in ['Mobile', 'Web']:
-            customer['channel_type'] = 'Digital First'
-        elif customer['channelpreference'] == 'Branch':
-            customer['channel_type'] = 'Relationship Banking'
-        else:
-            customer['channel_type'] = 'Self Service'
-        
-        # 9. Income Category
-        if customer['income'] > 200000:
-            customer['income_category'] = 'High Income'
-        elif customer['income'] > 100000:
-            customer['income_category'] = 'Upper Middle'
-        elif customer['income'] > 50000:
-            customer['income_category'] = 'Middle Income'
-        else:
-            customer['income_category'] = 'Lower Income'
-        
-        # 10. Customer Segment Name (Human Readable)
-        cluster = customer['cluster']
-        if cluster == 0:
-            customer['segment_name'] = 'Premium Loyalists'
-        elif cluster == 1:
-            customer['segment_name'] = 'Standard Savers'
-        elif cluster == 2:
-            customer['segment_name'] = 'Digital Seniors'
-        elif cluster == 3:
-            customer['segment_name'] = 'Retirement Planners'
-        else:
-            customer['segment_name'] = 'Growth Seekers'
-    
-    return customers
+def add_enhanced_segments(df):
+    """Add enhanced, human-readable segmentation columns to a customer DataFrame
+    
+    Every column is built as a categorical from small integer codes, so the
+    label strings are stored once per category rather than once per customer.
+    """
+    # 1. Customer Value Tier
+    df['value_tier'] = pd.cut(df['revenuecontribution'],
+                              bins=[-np.inf, 25000, 50000, 100000, np.inf],
+                              labels=['Bronze', 'Silver', 'Gold', 'Premium'])
+    
+    # 2. Risk Level
+    df['risk_level'] = pd.Categorical.from_codes(np.select(
+        [(df['delinquencycount'] > 3) | (df['creditutilizationratio'] > 0.8),
+         (df['delinquencycount'] > 1) | (df['creditutilizationratio'] > 0.6)],
+        [0, 1], default=2), ['High Risk', 'Medium Risk', 'Low Risk'])
+    
+    # 3. Digital Adoption Level
+    df['digital_level'] = pd.cut(df['digitalusage'], bins=[-np.inf, 40, 70, np.inf],
+                                 labels=['Traditional', 'Digital Adopter', 'Digital Native'])
+    
+    # 4. Engagement Status
+    df['engagement_status'] = pd.Categorical.from_codes(np.select(
+        [df['dormantdays'] > 180, df['dormantdays'] > 90, df['monthlytransactions'] > 100],
+        [0, 1, 2], default=3), ['Dormant', 'At Risk', 'Highly Active', 'Active'])
+    
+    # 5. Life Stage
+    df['life_stage'] = pd.cut(df['age'], bins=[-np.inf, 30, 45, 60, np.inf], right=False,
+                              labels=['Young Professional', 'Established Professional',
+                                      'Pre-Retirement', 'Retired'])
+    
+    # 6. Financial Health Score (1-3 points each for credit score, utilization, delinquencies)
+    health_score = (3
+                    + (df['creditscore'] > 600).astype(int) + (df['creditscore'] > 700).astype(int)
+                    + (df['creditutilizationratio'] < 0.6).astype(int)
+                    + (df['creditutilizationratio'] < 0.3).astype(int)
+                    + (df['delinquencycount'] < 2).astype(int) + (df['delinquencycount'] == 0).astype(int))
+    df['financial_health'] = pd.cut(health_score, bins=[-np.inf, 4, 6, 8, np.inf], right=False,
+                                    labels=['Poor', 'Fair', 'Good', 'Excellent'])
+    
+    # 7. Product Potential
+    df['product_potential'] = pd.cut(df['crosssellindex'], bins=[-np.inf, 1, 3, np.inf], right=False,
+                                     labels=['High Cross-sell', 'Medium Cross-sell', 'Low Cross-sell'])
+    
+    # 8. Channel Preference Type (compares category codes, not strings)
+    df['channel_type'] = pd.Categorical.from_codes(np.select(
+        [df['channelpreference'].isin(['Mobile', 'Web']), df['channelpreference'] == 'Branch'],
+        [0, 1], default=2), ['Digital First', 'Relationship Banking', 'Self Service'])
+    
+    # 9. Income Category
+    df['income_category'] = pd.cut(df['income'], bins=[-np.inf, 50000, 100000, 200000, np.inf],
+                                   labels=['Lower Income', 'Middle Income', 'Upper Middle',
+                                           'High Income'])
+    
+    # 10. Customer Segment Name (Human Readable); clusters past 3 are all Growth Seekers
+    df['segment_name'] = pd.Categorical.from_codes(
+        np.minimum(df['cluster'], 4),
+        ['Premium Loyalists', 'Standard Savers', 'Digital Seniors', 'Retirement Planners',
+         'Growth Seekers'])
+    
+    return df
 
-def create_banking_summary_report(customers, cluster_stats):
+def create_banking_summary_report(df, cluster_stats, totals):
     """Create comprehensive banking summary report"""
     print(f"\n📋 BANKING EXECUTIVE SUMMARY REPORT")
     print("=" * 80)
     
-    total_customers = len(customers)
-    total_revenue = sum(customer['revenuecontribution'] for customer in customers)
-    total_balance = sum(customer['avgbalance'] for customer in customers)
+    total_customers = len(df)
+    total_revenue = totals['revenue']
+    total_balance = totals['balance']
     
     # Top performing clusters
     top_clusters = sorted(cluster_stats, key=lambda x: x['revenue'], reverse=True)[:3]
@@ -558,28 +722,21 @@ def create_banking_summary_report(customers, cluster_stats):
     
     # Add enhanced segments
     print(f"\n🔧 Adding enhanced segmentation columns...")
-    customers = add_enhanced_segments(customers)
+    df = add_enhanced_segments(df)
     
     # Save detailed results with enhanced columns
-    with open('banking_customer_segments_enhanced.csv', 'w', newline='', encoding='utf-8') as f:
-        fieldnames = ['customerid', 'age', 'gender', 'income', 'occupation', 'location', 
-                     'householdsize', 'accounttype', 'accounttenureyears', 'avgbalance', 
-                     'balancevolatility', 'loantype', 'loanamount', 'creditscore', 
-                     'creditutilizationratio', 'delinquencycount', 'monthlytransactions', 
-                     'digitalusage', 'channelpreference', 'dormantdays', 'revenuecontribution', 
-                     'crosssellindex', 'salarypattern', 'spendcategory', 'cluster',
-                     'segment_name', 'value_tier', 'risk_level', 'digital_level', 
-                     'engagement_status', 'life_stage', 'financial_health', 
-                     'product_potential', 'channel_type', 'income_category']
-        
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        for customer in customers:
-            # Remove normalized fields for output
-            output_customer = {k: v for k, v in customer.items() 
-                             if not k.endswith('_norm')}
-            writer.writerow(output_customer)
+    fieldnames = ['customerid', 'age', 'gender', 'income', 'occupation', 'location', 
+                 'householdsize', 'accounttype', 'accounttenureyears', 'avgbalance', 
+                 'balancevolatility', 'loantype', 'loanamount', 'creditscore', 
+                 'creditutilizationratio', 'delinquencycount', 'monthlytransactions', 
+                 'digitalusage', 'channelpreference', 'dormantdays', 'revenuecontribution', 
+                 'crosssellindex', 'salarypattern', 'spendcategory', 'cluster',
+                 'segment_name', 'value_tier', 'risk_level', 'digital_level', 
+                 'engagement_status', 'life_stage', 'financial_health', 
+                 'product_potential', 'channel_type', 'income_category']
+    # Stream the rows out in chunks to bound the writer's memory on large customer bases
+    df[fieldnames].to_csv('banking_customer_segments_enhanced.csv', index=False,
+                          encoding='utf-8', chunksize=50000)
     
     print(f"\n💾 Enhanced results saved to: banking_customer_segments_enhanced.csv")
     
@@ -588,32 +745,32 @@ def create_banking_summary_report(customers, cluster_stats):
     print("-" * 50)
     
     # Value Tier Distribution
-    value_tiers = Counter(c['value_tier'] for c in customers)
-    print(f"💰 Value Tiers: {dict(value_tiers)}")
+    value_tiers = _category_counts(df.groupby('value_tier', observed=True, sort=False).size())
+    print(f"💰 Value Tiers: {value_tiers}")
     
     # Risk Level Distribution
-    risk_levels = Counter(c['risk_level'] for c in customers)
-    print(f"⚠️ Risk Levels: {dict(risk_levels)}")
+    risk_levels = _category_counts(df.groupby('risk_level', observed=True, sort=False).size())
+    print(f"⚠️ Risk Levels: {risk_levels}")
     
     # Digital Level Distribution
-    digital_levels = Counter(c['digital_level'] for c in customers)
-    print(f"📱 Digital Levels: {dict(digital_levels)}")
+    digital_levels = _category_counts(df.groupby('digital_level', observed=True, sort=False).size())
+    print(f"📱 Digital Levels: {digital_levels}")
     
     # Engagement Status Distribution
-    engagement_status = Counter(c['engagement_status'] for c in customers)
-    print(f"🎯 Engagement Status: {dict(engagement_status)}")
+    engagement_status = _category_counts(df.groupby('engagement_status', observed=True, sort=False).size())
+    print(f"🎯 Engagement Status: {engagement_status}")
     
     # Life Stage Distribution
-    life_stages = Counter(c['life_stage'] for c in customers)
-    print(f"👥 Life Stages: {dict(life_stages)}")
+    life_stages = _category_counts(df.groupby('life_stage', observed=True, sort=False).size())
+    print(f"👥 Life Stages: {life_stages}")
     
     # Financial Health Distribution
-    financial_health = Counter(c['financial_health'] for c in customers)
-    print(f"💚 Financial Health: {dict(financial_health)}")
+    financial_health = _category_counts(df.groupby('financial_health', observed=True, sort=False).size())
+    print(f"💚 Financial Health: {financial_health}")
     
     # Segment Names Distribution
-    segment_names = Counter(c['segment_name'] for c in customers)
-    print(f"🏷️ Segment Names: {dict(segment_names)}")
+    segment_names = _category_counts(df.groupby('segment_name', observed=True, sort=False).size())
+    print(f"🏷️ Segment Names: {segment_names}")
 
 def main():
     """Main execution function for banking customer segmentation"""
@@ -623,36 +780,43 @@ def main():
     # Load banking data
     print("📊 Step 1: Loading banking customer data...")
     file_path = r"C:\Users\2025i\Downloads\banking_customer_segmentation_final.csv"
-    customers = load_banking_data(file_path)
-    print(f"   ✅ Loaded {len(customers)} banking customer records")
+    df = load_banking_data(file_path)
+    print(f"   ✅ Loaded {len(df)} banking customer records")
+    
+    # Portfolio totals, computed once and shared by every report
+    totals = {
+        'revenue': df['revenuecontribution'].sum(),
+        'balance': df['avgbalance'].sum()
+    }
     
     # Preprocess data
     print("🔧 Step 2: Preprocessing banking data...")
-    customers, features = preprocess_banking_data(customers)
+    X, features, df = preprocess_banking_data(df)
     print(f"   ✅ Preprocessed {len(features)} numerical features")
     
     # Perform clustering
     print("🔍 Step 3: Performing K-means clustering...")
-    customers, centroids, clusters = banking_kmeans(customers, k=5)
+    labels, centroids = banking_kmeans(X, k=5)
+    df['cluster'] = labels
     print(f"   ✅ Clustering completed with 5 distinct segments")
     
     # Analyze clusters
     print("📈 Step 4: Conducting detailed cluster analysis...")
-    cluster_stats, clusters_dict = analyze_banking_clusters(customers)
+    cluster_stats = analyze_banking_clusters(df, totals)
     
     # Generate insights
     print("💡 Step 5: Generating banking business insights...")
-    generate_banking_insights(cluster_stats, clusters_dict)
+    generate_banking_insights(cluster_stats)
     
     # Summary report
     print("📋 Step 6: Creating executive summary report...")
-    create_banking_summary_report(customers, cluster_stats)
+    create_banking_summary_report(df, cluster_stats, totals)
     
     print(f"\n🎉 BANKING ANALYSIS COMPLETED SUCCESSFULLY!")
     print("=" * 80)
-    print(f"📊 Analyzed {len(customers)} banking customers")
+    print(f"📊 Analyzed {len(df)} banking customers")
     print(f"🎯 Identified {len(cluster_stats)} distinct segments")
-    print(f"💰 Total customer revenue: ₹{sum(c['revenuecontribution'] for c in customers):,.2f}")
+    print(f"💰 Total customer revenue: ₹{totals['revenue']:,.2f}")
     print(f"💾 Detailed results saved to CSV file")
 
 if __name__ == "__main__":
@@ -6,245 +6,392 @@ This script performs comprehensive customer segmentation using K-means clusterin
 with detailed analysis, insights, and business recommendations.
 """
 
-import random
-import math
-from collections import defaultdict
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Clustering features with their normalization divisors and business-importance
+# weights; days since last purchase is inverted so recent activity scores high
+FEATURES = ['age', 'annual_income', 'spending_score', 'total_purchases',
+            'avg_order_value', 'days_since_last_purchase', 'email_opens']
+SCALE = np.array([80, 200000, 100, 60, 200, 180, 25], dtype=np.float32)
+WEIGHTS = np.array([0.1, 0.2, 0.25, 0.15, 0.15, 0.1, 0.05], dtype=np.float32)
+INVERT = np.array([0, 0, 0, 0, 0, 1, 0], dtype=bool)
+
+# Rows per block of the distance matrix, small enough to stay in L2 cache
+CHUNK = 256
+
+@dataclass
+class CustomerTable:
+    """Customer attributes stored column-wise, one NumPy array per attribute"""
+    id: np.ndarray
+    age: np.ndarray
+    annual_income: np.ndarray
+    spending_score: np.ndarray
+    total_purchases: np.ndarray
+    avg_order_value: np.ndarray
+    days_since_last_purchase: np.ndarray
+    email_opens: np.ndarray
+    website_visits: np.ndarray
+    lifetime_value: np.ndarray
+    cluster: np.ndarray = None
+    
+    def __len__(self):
+        return len(self.id)
+
+def _draw_banded(n, bands, dtype):
+    """Fill an array band by band from (mask, draw) pairs, where draw(size) returns random values"""
+    values = np.empty(n, dtype=dtype)
+    for mask, draw in bands:
+        values[mask] = draw(int(mask.sum()))
+    return values
 
 def generate_realistic_customer_data(n_customers=1000):
-    """Generate realistic customer data with correlations"""
-    random.seed(42)
-    
-    customers = []
-    for i in range(n_customers):
-        # Create realistic correlations
-        age = max(18, min(80, int(random.normalvariate(38, 15))))
-        
-        # Income correlates with age (older = higher income)
-        base_income = 25000 + (age - 18) * 800
-        annual_income = max(20000, min(200000, random.normalvariate(base_income, 15000)))
-        
-        # Spending score correlates with income
-        if annual_income > 80000:
-            spending_score = random.randint(60, 100)
-        elif annual_income > 50000:
-            spending_score = random.randint(40, 80)
-        else:
-            spending_score = random.randint(1, 60)
-        
-        # Purchase behavior correlates with spending score
-        if spending_score > 70:
-            total_purchases = random.randint(20, 60)
-            avg_order_value = random.uniform(80, 200)
-        elif spending_score > 40:
-            total_purchases = random.randint(10, 30)
-            avg_order_value = random.uniform(40, 120)
-        else:
-            total_purchases = random.randint(1, 20)
-            avg_order_value = random.uniform(10, 80)
+    """Generate realistic customer data with correlations
+    
+    Returns a CustomerTable of equal-length NumPy arrays.
+    """
+    rng = np.random.default_rng(42)
+    n = n_customers
+    
+    # Create realistic correlations
+    age = np.clip(rng.normal(38, 15, n).astype(int), 18, 80)
+    
+    # Income correlates with age (older = higher income)
+    base_income = 25000 + (age - 18) * 800
+    annual_income = np.clip(rng.normal(base_income, 15000), 20000, 200000)
+    
+    # Spending score correlates with income
+    high_income = annual_income > 80000
+    mid_income = (annual_income > 50000) & ~high_income
+    spending_score = _draw_banded(n, [
+        (high_income, lambda size: rng.integers(60, 101, size)),
+        (mid_income, lambda size: rng.integers(40, 81, size)),
+        (~(high_income | mid_income), lambda size: rng.integers(1, 61, size)),
+    ], int)
+    
+    # Purchase behavior correlates with spending score
+    high_spend = spending_score > 70
+    mid_spend = (spending_score > 40) & ~high_spend
+    low_spend = ~(high_spend | mid_spend)
+    total_purchases = _draw_banded(n, [
+        (high_spend, lambda size: rng.integers(20, 61, size)),
+        (mid_spend, lambda size: rng.integers(10, 31, size)),
+        (low_spend, lambda size: rng.integers(1, 21, size)),
+    ], int)
+    avg_order_value = _draw_banded(n, [
+        (high_spend, lambda size: rng.uniform(80, 200, size)),
+        (mid_spend, lambda size: rng.uniform(40, 120, size)),
+        (low_spend, lambda size: rng.uniform(10, 80, size)),
+    ], float)
+    
+    # Recency correlates with engagement
+    engaged = spending_score > 60
+    casual = (spending_score > 30) & ~engaged
+    days_since_last = _draw_banded(n, [
+        (engaged, lambda size: rng.integers(1, 31, size)),
+        (casual, lambda size: rng.integers(15, 61, size)),
+        (~(engaged | casual), lambda size: rng.integers(30, 181, size)),
+    ], int)
+    
+    # Digital engagement
+    young = age < 35
+    email_opens = _draw_banded(n, [
+        (young, lambda size: rng.integers(8, 26, size)),
+        (~young, lambda size: rng.integers(2, 16, size)),
+    ], int)
+    website_visits = _draw_banded(n, [
+        (young, lambda size: rng.integers(15, 41, size)),
+        (~young, lambda size: rng.integers(5, 26, size)),
+    ], int)
+    
+    return CustomerTable(
+        id=np.arange(1, n + 1),
+        age=age,
+        annual_income=np.round(annual_income).astype(int),
+        spending_score=spending_score,
+        total_purchases=total_purchases,
+        avg_order_value=np.round(avg_order_value, 2),
+        days_since_last_purchase=days_since_last,
+        email_opens=email_opens,
+        website_visits=website_visits,
+        lifetime_value=np.round(total_purchases * avg_order_value, 2)
+    )
+
+def _seed_sq_distances(X, x2, i, out):
+    """Write the squared distances of every row of X to row i into out, via the cached norms x2"""
+    np.matmul(X, X[i], out=out)
+    out *= -2
+    out += x2
+    out += x2[i]
+    return out
+
+def _chunked_sq_distances(X, x2, C):
+    """Row-to-centroid squared distances via ||x||^2 + ||c||^2 - 2x.c, one CHUNK of rows at a time
+    
+    x2 holds the precomputed squared row norms of X; only the K centroid
+    norms are computed here.
+    """
+    c2 = (C * C).sum(axis=1)
+    minus_2ct = -2 * C.T
+    d2 = np.empty((len(X), len(C)), dtype=X.dtype)
+    for s in range(0, len(X), CHUNK):
+        block = d2[s:s + CHUNK]
+        np.matmul(X[s:s + CHUNK], minus_2ct, out=block)
+        block += x2[s:s + CHUNK, None]
+        block += c2
+    return np.maximum(d2, 0, out=d2)
+
+# Fits with fewer row-centroid pairs than this stay on the NumPy path: below
+# it, importing Numba and loading the compiled kernel cost more than they save
+NUMBA_MIN_PAIRS = 2_000_000
+
+_lloyd_iter_cache = None
+
+def _numba_lloyd_iter():
+    """Import Numba and build the Lloyd iteration kernel on first use
+    
+    Returns (lloyd_iter, get_num_threads), or None when Numba is not
+    installed, in which case k-means uses the NumPy path.
+    """
+    global _lloyd_iter_cache
+    if _lloyd_iter_cache is not None:
+        return _lloyd_iter_cache or None
+    try:
+        from numba import njit, prange, get_num_threads
+    except ImportError:
+        _lloyd_iter_cache = False
+        return None
+    
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _lloyd_iter(X, C, new_C, labels, n_threads):
+        """One Lloyd iteration: assign each row to its nearest centroid and write new centroids to new_C"""
+        n, d = X.shape
+        k = C.shape[0]
         
-        # Recency correlates with engagement
-        if spending_score > 60:
-            days_since_last = random.randint(1, 30)
-        elif spending_score > 30:
-            days_since_last = random.randint(15, 60)
-        else:
-            days_since_last = random.randint(30, 180)
+        # Assign customers to nearest centroid (squared distance), dropping a
+        # centroid as soon as its partial sum exceeds the best distance so far
+        for i in prange(n):
+            # Seed the running minimum with centroid 0, then a single pass
+            # over the rest keeps the first index of the smallest distance
+            best_j = 0
+            best_d = np.float32(0.0)
+            for f in range(d):
+                diff = X[i, f] - C[0, f]
+                best_d += diff * diff
+            for j in range(1, k):
+                dist = np.float32(0.0)
+                for f in range(d):
+                    diff = X[i, f] - C[j, f]
+                    dist += diff * diff
+                    if dist > best_d:
+                        break
+                if dist < best_d:
+                    best_d = dist
+                    best_j = j
+            labels[i] = best_j
         
-        # Digital engagement
-        if age < 35:
-            email_opens = random.randint(8, 25)
-            website_visits = random.randint(15, 40)
-        else:
-            email_opens = random.randint(2, 15)
-            website_visits = random.randint(5, 25)
+        # Accumulate per-cluster sums in per-thread buffers, then reduce
+        chunk = (n + n_threads - 1) // n_threads
+        sums = np.zeros((n_threads, k, d))
+        counts = np.zeros((n_threads, k), dtype=np.int64)
+        for t in prange(n_threads):
+            for i in range(t * chunk, min(n, (t + 1) * chunk)):
+                j = labels[i]
+                counts[t, j] += 1
+                for f in range(d):
+                    sums[t, j, f] += X[i, f]
         
-        customer = {
-            'id': i + 1,
-            'age': age,
-            'annual_income': round(annual_income),
-            'spending_score': spending_score,
-            'total_purchases': total_purchases,
-            'avg_order_value': round(avg_order_value, 2),
-            'days_since_last_purchase': days_since_last,
-            'email_opens': email_opens,
-            'website_visits': website_visits,
-            'lifetime_value': round(total_purchases * avg_order_value, 2)
-        }
-        customers.append(customer)
-    
-    return customers
+        total_sums = sums.sum(axis=0)
+        total_counts = counts.sum(axis=0)
+        for j in range(k):
+            for f in range(d):
+                if total_counts[j] > 0:
+                    new_C[j, f] = total_sums[j, f] / total_counts[j]
+                else:  # Keep empty clusters in place
+                    new_C[j, f] = C[j, f]
+    
+    _lloyd_iter_cache = (_lloyd_iter, get_num_threads)
+    return _lloyd_iter_cache
 
-def calculate_distance(customer1, customer2, features):
-    """Calculate weighted Euclidean distance between customers"""
-    weights = {
-        'age': 0.1,
-        'annual_income': 0.2,
-        'spending_score': 0.25,
-        'total_purchases': 0.15,
-        'avg_order_value': 0.15,
-        'days_since_last_purchase': 0.1,
-        'email_opens': 0.05
-    }
-    
-    distance = 0
-    for feature in features:
-        if feature == 'age':
-            val1 = customer1[feature] / 80
-            val2 = customer2[feature] / 80
-        elif feature == 'annual_income':
-            val1 = customer1[feature] / 200000
-            val2 = customer2[feature] / 200000
-        elif feature == 'spending_score':
-            val1 = customer1[feature] / 100
-            val2 = customer2[feature] / 100
-        elif feature == 'total_purchases':
-            val1 = customer1[feature] / 60
-            val2 = customer2[feature] / 60
-        elif feature == 'avg_order_value':
-            val1 = customer1[feature] / 200
-            val2 = customer2[feature] / 200
-        elif feature == 'days_since_last_purchase':
-            val1 = 1 - (customer1[feature] / 180)  # Invert for recency
-            val2 = 1 - (customer2[feature] / 180)
-        elif feature == 'email_opens':
-            val1 = customer1[feature] / 25
-            val2 = customer2[feature] / 25
-        
-        weight = weights.get(feature, 1.0)
-        distance += weight * ((val1 - val2) ** 2)
-    
-    return math.sqrt(distance)
+def _elkan_assign(X, C, labels, upper, lower):
+    """Reassign customers to their nearest centroid using Elkan's triangle-inequality bounds
+    
+    Updates labels, upper (distance bound to the assigned centroid) and
+    lower (per-centroid distance bounds) in place.
+    """
+    cc = np.sqrt(((C[:, None, :] - C[None, :, :]) ** 2).sum(axis=2))
+    np.fill_diagonal(cc, np.inf)
+    half_nearest = 0.5 * cc.min(axis=1)
+    
+    # Customers closer to their centroid than half the gap to any other stay put
+    active = np.flatnonzero(upper > half_nearest[labels])
+    if active.size == 0:
+        return
+    
+    # Tighten the upper bound with the exact distance to the assigned centroid
+    upper[active] = np.sqrt(((X[active] - C[labels[active]]) ** 2).sum(axis=1))
+    lower[active, labels[active]] = upper[active]
+    
+    for j in range(len(C)):
+        assigned = labels[active]
+        candidates = active[(assigned != j) &
+                            (upper[active] > lower[active, j]) &
+                            (upper[active] > 0.5 * cc[assigned, j])]
+        if candidates.size == 0:
+            continue
+        d = np.sqrt(((X[candidates] - C[j]) ** 2).sum(axis=1))
+        lower[candidates, j] = d
+        closer = d < upper[candidates]
+        labels[candidates[closer]] = j
+        upper[candidates[closer]] = d[closer]
 
 def advanced_kmeans(customers, k=5, max_iterations=50):
     """Advanced K-means with better initialization"""
-    features = ['age', 'annual_income', 'spending_score', 'total_purchases', 
-                'avg_order_value', 'days_since_last_purchase', 'email_opens']
-    
-    # Smart initialization: select diverse customers as initial centroids
-    centroids = []
-    centroids.append(customers[0].copy())
-    
+    # Normalized, sqrt-weighted feature matrix: squared Euclidean distances
+    # between its rows are the weighted distances between customers
+    X = np.column_stack([getattr(customers, f) for f in FEATURES]).astype(np.float32) / SCALE
+    X[:, INVERT] = 1 - X[:, INVERT]
+    X *= np.sqrt(WEIGHTS)
+    x2 = (X * X).sum(axis=1)
+    
+    # Convergence tolerance of 0.01 in original feature units, in X's units
+    tol = 0.01 * np.sqrt(WEIGHTS) / SCALE
+    
+    # Smart initialization: farthest-point seeding, keeping each customer's
+    # squared distance to its nearest centroid chosen so far. Distances to a
+    # new seed come from one matrix-vector product plus the cached norms,
+    # written into a single scratch vector reused for every seed.
+    centroid_idx = [0]
+    min_d2 = _seed_sq_distances(X, x2, 0, np.empty_like(x2))
+    d2 = np.empty_like(x2)
     for _ in range(k-1):
-        max_distance = 0
-        best_customer = None
-        
-        for customer in customers:
-            min_distance_to_centroids = min([
-                calculate_distance(customer, centroid, features) 
-                for centroid in centroids
-            ])
-            
-            if min_distance_to_centroids > max_distance:
-                max_distance = min_distance_to_centroids
-                best_customer = customer
-        
-        if best_customer:
-            centroids.append(best_customer.copy())
-    
-    # K-means iterations
-    for iteration in range(max_iterations):
-        clusters = [[] for _ in range(k)]
-        
-        # Assign customers to nearest centroid
-        for customer in customers:
-            distances = [
-                calculate_distance(customer, centroid, features) 
-                for centroid in centroids
-            ]
-            closest_cluster = distances.index(min(distances))
-            clusters[closest_cluster].append(customer)
-        
-        # Update centroids
-        new_centroids = []
-        for cluster in clusters:
-            if cluster:
-                new_centroid = {}
-                for feature in features:
-                    values = [customer[feature] for customer in cluster]
-                    new_centroid[feature] = sum(values) / len(values)
-                new_centroids.append(new_centroid)
+        i = int(np.argmax(min_d2))
+        centroid_idx.append(i)
+        np.minimum(min_d2, _seed_sq_distances(X, x2, i, d2), out=min_d2)
+    
+    C = X[centroid_idx]  # Fancy indexing already copies the seed rows
+    
+    # K-means iterations, swapping between two preallocated centroid buffers
+    new_C = np.empty_like(C)
+    kernel = _numba_lloyd_iter() if len(X) * k >= NUMBA_MIN_PAIRS else None
+    if kernel is not None:
+        # Compiled path for large fits: the whole iteration runs in one parallel kernel
+        lloyd_iter, get_num_threads = kernel
+        labels = np.empty(len(X), dtype=np.int32)
+        n_threads = get_num_threads()
+        for iteration in range(max_iterations):
+            lloyd_iter(X, C, new_C, labels, n_threads)
+            converged = bool(np.all(np.abs(new_C - C) <= tol))
+            C, new_C = new_C, C
+            if converged:
+                break
+    else:
+        labels = None
+        for iteration in range(max_iterations):
+            if labels is None:
+                # Assign customers to nearest centroid; argmin needs no sqrt,
+                # only the Elkan bounds are kept as true distances
+                d2 = _chunked_sq_distances(X, x2, C)
+                labels = np.argmin(d2, axis=1).astype(np.int32)
+                lower = np.sqrt(d2, out=d2)
+                upper = lower[np.arange(len(X)), labels]
             else:
-                new_centroids.append(centroids[len(new_centroids)])
-        
-        # Check convergence
-        converged = True
-        for i in range(k):
-            for feature in features:
-                if abs(centroids[i][feature] - new_centroids[i][feature]) > 0.01:
-                    converged = False
-                    break
-            if not converged:
+                # Only recompute distances the bounds cannot rule out
+                _elkan_assign(X, C, labels, upper, lower)
+            
+            # Update centroids with one grouped sum per feature
+            counts = np.bincount(labels, minlength=len(C))
+            sums = np.zeros_like(C)
+            for f in range(X.shape[1]):
+                sums[:, f] = np.bincount(labels, weights=X[:, f], minlength=len(C))
+            np.divide(sums, counts.clip(min=1).astype(np.float32)[:, None], out=new_C)
+            new_C[counts == 0] = C[counts == 0]  # Keep empty clusters in place
+            
+            # Loosen the bounds by how far each centroid moved
+            shift = np.sqrt(((new_C - C) ** 2).sum(axis=1))
+            upper += shift[labels]
+            np.maximum(lower - shift, 0, out=lower)
+            
+            # Check convergence
+            converged = bool(np.all(np.abs(new_C - C) <= tol))
+            
+            C, new_C = new_C, C
+            if converged:
                 break
-        
-        centroids = new_centroids
-        if converged:
-            break
     
     # Assign final cluster labels
-    for i, cluster in enumerate(clusters):
-        for customer in cluster:
-            customer['cluster'] = i
+    customers.cluster = labels
+    clusters = [np.flatnonzero(labels == j) for j in range(len(C))]
     
-    return customers, centroids, clusters
+    return customers, C, clusters
 
-def detailed_cluster_analysis(customers):
-    """Perform detailed analysis of each cluster"""
-    print("=" * 80)
-    print("🎯 ADVANCED CUSTOMER SEGMENTATION ANALYSIS")
-    print("=" * 80)
+def detailed_cluster_analysis(customers, total_revenue, per_cluster_rev):
+    """Perform detailed analysis of each cluster
     
-    # Group by clusters
-    clusters = defaultdict(list)
-    for customer in customers:
-        clusters[customer['cluster']].append(customer)
+    total_revenue and per_cluster_rev (lifetime value summed per cluster
+    label) are computed once by the caller.
+    """
+    lines = []
+    lines.append("=" * 80)
+    lines.append("🎯 ADVANCED CUSTOMER SEGMENTATION ANALYSIS")
+    lines.append("=" * 80)
+    
+    # Group by clusters (row indices of each cluster's customers)
+    labels = customers.cluster
+    clusters = {cluster_id: np.flatnonzero(labels == cluster_id) for cluster_id in np.unique(labels)}
     
     # Overall statistics
-    total_customers = len(customers)
-    total_revenue = sum(customer['lifetime_value'] for customer in customers)
+    total_customers = len(labels)
     
-    print(f"\n📊 OVERVIEW:")
-    print(f"   Total Customers: {total_customers:,}")
-    print(f"   Total Revenue: ${total_revenue:,.2f}")
-    print(f"   Average Customer Value: ${total_revenue/total_customers:,.2f}")
+    lines.append(f"\n📊 OVERVIEW:")
+    lines.append(f"   Total Customers: {total_customers:,}")
+    lines.append(f"   Total Revenue: ${total_revenue:,.2f}")
+    lines.append(f"   Average Customer Value: ${total_revenue/total_customers:,.2f}")
     
     # Cluster analysis
-    print(f"\n🔍 CLUSTER ANALYSIS:")
-    print("-" * 80)
+    lines.append(f"\n🔍 CLUSTER ANALYSIS:")
+    lines.append("-" * 80)
     
     features = ['age', 'annual_income', 'spending_score', 'total_purchases', 
                 'avg_order_value', 'days_since_last_purchase', 'email_opens', 'website_visits', 'lifetime_value']
     
+    # Per-cluster feature averages, one grouped sum per feature column
+    feat_matrix = np.column_stack([getattr(customers, feature) for feature in features])
+    k = len(per_cluster_rev)
+    counts = np.maximum(np.bincount(labels, minlength=k), 1).astype(np.float64)
+    cluster_means = np.empty((k, len(features)))
+    for f in range(len(features)):
+        cluster_means[:, f] = np.bincount(labels, weights=feat_matrix[:, f], minlength=k) / counts
+    
     cluster_stats = []
     
     for cluster_id in sorted(clusters.keys()):
-        cluster_customers = clusters[cluster_id]
-        cluster_size = len(cluster_customers)
+        members = clusters[cluster_id]
+        cluster_size = len(members)
         cluster_percentage = (cluster_size / total_customers) * 100
-        cluster_revenue = sum(customer['lifetime_value'] for customer in cluster_customers)
+        cluster_revenue = per_cluster_rev[cluster_id]
         cluster_avg_value = cluster_revenue / cluster_size
         
-        print(f"\n🏷️  CLUSTER {cluster_id} ({cluster_size} customers - {cluster_percentage:.1f}%)")
-        print(f"   Revenue Contribution: ${cluster_revenue:,.2f} ({cluster_revenue/total_revenue*100:.1f}%)")
-        print(f"   Average Customer Value: ${cluster_avg_value:,.2f}")
+        lines.append(f"\n🏷️  CLUSTER {cluster_id} ({cluster_size} customers - {cluster_percentage:.1f}%)")
+        lines.append(f"   Revenue Contribution: ${cluster_revenue:,.2f} ({cluster_revenue/total_revenue*100:.1f}%)")
+        lines.append(f"   Average Customer Value: ${cluster_avg_value:,.2f}")
         
-        # Calculate averages
-        cluster_avg = {}
-        for feature in features:
-            values = [customer[feature] for customer in cluster_customers]
-            cluster_avg[feature] = sum(values) / len(values)
+        cluster_avg = dict(zip(features, cluster_means[cluster_id]))
         
-        print(f"   📈 Key Metrics:")
-        print(f"      • Average Age: {cluster_avg['age']:.1f} years")
-        print(f"      • Average Income: ${cluster_avg['annual_income']:,.0f}")
-        print(f"      • Spending Score: {cluster_avg['spending_score']:.1f}/100")
-        print(f"      • Total Purchases: {cluster_avg['total_purchases']:.1f}")
-        print(f"      • Average Order Value: ${cluster_avg['avg_order_value']:.2f}")
-        print(f"      • Days Since Last Purchase: {cluster_avg['days_since_last_purchase']:.1f}")
-        print(f"      • Email Engagement: {cluster_avg['email_opens']:.1f} opens")
-        print(f"      • Website Visits: {cluster_avg['website_visits']:.1f}")
+        lines.append(f"   📈 Key Metrics:")
+        lines.append(f"      • Average Age: {cluster_avg['age']:.1f} years")
+        lines.append(f"      • Average Income: ${cluster_avg['annual_income']:,.0f}")
+        lines.append(f"      • Spending Score: {cluster_avg['spending_score']:.1f}/100")
+        lines.append(f"      • Total Purchases: {cluster_avg['total_purchases']:.1f}")
+        lines.append(f"      • Average Order Value: ${cluster_avg['avg_order_value']:.2f}")
+        lines.append(f"      • Days Since Last Purchase: {cluster_avg['days_since_last_purchase']:.1f}")
+        lines.append(f"      • Email Engagement: {cluster_avg['email_opens']:.1f} opens")
+        lines.append(f"      • Website Visits: {cluster_avg['website_visits']:.1f}")
         
         cluster_stats.append({
-            'id': cluster_id,
+            'id': int(cluster_id),
             'size': cluster_size,
             'percentage': cluster_percentage,
             'revenue': cluster_revenue,
@@ -252,12 +399,14 @@ def detailed_cluster_analysis(customers):
             'averages': cluster_avg
         })
     
+    print('\n'.join(lines))
     return cluster_stats, clusters
 
 def generate_business_insights(cluster_stats, clusters):
     """Generate detailed business insights and recommendations"""
-    print(f"\n💡 BUSINESS INSIGHTS & STRATEGIC RECOMMENDATIONS")
-    print("=" * 80)
+    lines = []
+    lines.append(f"\n💡 BUSINESS INSIGHTS & STRATEGIC RECOMMENDATIONS")
+    lines.append("=" * 80)
     
     # Sort clusters by revenue contribution
     sorted_clusters = sorted(cluster_stats, key=lambda x: x['revenue'], reverse=True)
@@ -267,8 +416,8 @@ def generate_business_insights(cluster_stats, clusters):
         cluster_customers = clusters[cluster_id]
         avg = cluster['averages']
         
-        print(f"\n🎯 CLUSTER {cluster_id} - {cluster['size']} customers (${cluster['revenue']:,.0f} revenue)")
-        print("-" * 60)
+        lines.append(f"\n🎯 CLUSTER {cluster_id} - {cluster['size']} customers (${cluster['revenue']:,.0f} revenue)")
+        lines.append("-" * 60)
         
         # Determine segment type and characteristics
         if avg['spending_score'] > 70 and avg['total_purchases'] > 25:
@@ -337,14 +486,14 @@ def generate_business_insights(cluster_stats, clusters):
                 "🎯 Targeted promotions based on purchase history"
             ]
         
-        print(f"Segment Type: {segment_type}")
-        print(f"Key Characteristics:")
+        lines.append(f"Segment Type: {segment_type}")
+        lines.append(f"Key Characteristics:")
         for char in characteristics:
-            print(f"   • {char}")
+            lines.append(f"   • {char}")
         
-        print(f"Strategic Recommendations:")
+        lines.append(f"Strategic Recommendations:")
         for rec in recommendations:
-            print(f"   {rec}")
+            lines.append(f"   {rec}")
         
         # Calculate potential impact
         current_avg_value = cluster['avg_value']
@@ -357,15 +506,16 @@ def generate_business_insights(cluster_stats, clusters):
         else:
             potential_increase = current_avg_value * 0.10  # 10% increase potential
         
-        print(f"💰 Revenue Potential: ${potential_increase * cluster['size']:,.0f} additional revenue")
+        lines.append(f"💰 Revenue Potential: ${potential_increase * cluster['size']:,.0f} additional revenue")
+    
+    print('\n'.join(lines))
 
-def create_summary_report(customers, cluster_stats):
+def create_summary_report(customers, cluster_stats, total_revenue):
     """Create a comprehensive summary report"""
     print(f"\n📋 EXECUTIVE SUMMARY REPORT")
     print("=" * 80)
     
     total_customers = len(customers)
-    total_revenue = sum(customer['lifetime_value'] for customer in customers)
     
     # Top performing clusters
     top_clusters = sorted(cluster_stats, key=lambda x: x['revenue'], reverse=True)[:3]
@@ -386,20 +536,8 @@ def create_summary_report(customers, cluster_stats):
     print(f"   4. Enhance digital experience for younger demographics")
     
     # Save detailed results
-    with open('customer_segments_detailed.csv', 'w') as f:
-        header = ['customer_id', 'age', 'annual_income', 'spending_score', 'total_purchases',
-                  'avg_order_value', 'days_since_last_purchase', 'email_opens', 'website_visits', 
-                  'lifetime_value', 'cluster']
-        f.write(','.join(header) + '\n')
-        
-        for customer in customers:
-            row = []
-            for field in header:
-                if field == 'customer_id':
-                    row.append(str(customer.get('id', '')))
-                else:
-                    row.append(str(customer.get(field, '')))
-            f.write(','.join(row) + '\n')
+    detailed = pd.DataFrame(vars(customers)).rename(columns={'id': 'customer_id'})
+    detailed.to_csv('customer_segments_detailed.csv', index=False)
     
     print(f"\n💾 Results saved to: customer_segments_detailed.csv")
 
@@ -418,9 +556,14 @@ def main():
     customers, centroids, clusters = advanced_kmeans(customers, k=5)
     print(f"   ✅ Clustering completed with 5 distinct segments")
     
+    # Revenue totals, computed once and shared by every report
+    total_revenue = customers.lifetime_value.sum()
+    per_cluster_rev = np.bincount(customers.cluster, weights=customers.lifetime_value,
+                                  minlength=len(centroids))
+    
     # Detailed analysis
     print("📈 Step 3: Conducting detailed cluster analysis...")
-    cluster_stats, clusters_dict = detailed_cluster_analysis(customers)
+    cluster_stats, clusters_dict = detailed_cluster_analysis(customers, total_revenue, per_cluster_rev)
     
     # Business insights
     print("💡 Step 4: Generating business insights and recommendations...")
@@ -428,13 +571,13 @@ def main():
     
     # Summary report
     print("📋 Step 5: Creating executive summary report...")
-    create_summary_report(customers, cluster_stats)
+    create_summary_report(customers, cluster_stats, total_revenue)
     
     print(f"\n🎉 ANALYSIS COMPLETED SUCCESSFULLY!")
     print("=" * 80)
     print(f"📊 Analyzed {len(customers)} customers")
     print(f"🎯 Identified {len(cluster_stats)} distinct segments")
-    print(f"💰 Total customer value: ${sum(c['lifetime_value'] for c in customers):,.2f}")
+    print(f"💰 Total customer value: ${total_revenue:,.2f}")
     print(f"💾 Detailed results saved to CSV file")
 
 if __name__ == "__main__":